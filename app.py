@@ -1,19 +1,53 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from anyio import to_thread
+import orjson
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from functools import lru_cache
+from contextlib import asynccontextmanager
+from itertools import accumulate
+from bisect import bisect_left, bisect_right
 import swisseph as swe
-import pytz
-import math
+import time
 import logging
+import os
+import threading
 
 # ====================== LOGGING ======================
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 logger.info("AstroVed Ultimate Vedic API started - Nov 21 2025")
 
-app = FastAPI(title="AstroVed Ultimate Vedic API")
+class ORJSONResponse(JSONResponse):
+    # fastapi.responses.ORJSONResponse is deprecated; same renderer, kept local
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Chart requests are CPU-bound C calls holding the GIL; size the worker pool to
+    # the host instead of anyio's fixed default of 40 threads
+    to_thread.current_default_thread_limiter().total_tokens = (os.cpu_count() or 1) * 2
+    await to_thread.run_sync(_warm_ephemeris)
+    yield
+
+app = FastAPI(title="AstroVed Ultimate Vedic API", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+# Swiss Ephemeris keeps its settings (ephemeris path, sidereal mode) in thread-local
+# storage, so each worker thread configures itself once before its first chart
+# instead of every request resetting them
+EPHE_PATH = "/app/ephe"
+_swe_thread = threading.local()
+
+def _init_swe():
+    if not getattr(_swe_thread, "ready", False):
+        swe.set_ephe_path(EPHE_PATH)
+        swe.set_sid_mode(swe.SIDM_LAHIRI)
+        _swe_thread.ready = True
 
-swe.set_ephe_path("/app/ephe")
+_init_swe()
 
 class BirthInput(BaseModel):
     name: str
@@ -25,428 +59,498 @@ class BirthInput(BaseModel):
     latitude: float
     longitude: float
     timezone: str
+    # False drops antardashaList/pratyantardashaList for clients that only need the
+    # running periods, which skips most of the dasha date formatting
+    include_lists: bool = True
 
 # ====================== CONSTANTS ======================
-SIGNS = ["Aries","Taurus","Gemini","Cancer","Leo","Virgo","Libra","Scorpio","Sagittarius","Capricorn","Aquarius","Pisces"]
-NAKSHATRAS = ["Ashwini","Bharani","Krittika","Rohini","Mrigashira","Ardra","Punavasu","Pushya","Ashlesha",
+SIGNS = ("Aries","Taurus","Gemini","Cancer","Leo","Virgo","Libra","Scorpio","Sagittarius","Capricorn","Aquarius","Pisces")
+NAKSHATRAS = ("Ashwini","Bharani","Krittika","Rohini","Mrigashira","Ardra","Punavasu","Pushya","Ashlesha",
               "Magha","Purva Phalguni","Uttara Phalguni","Hasta","Chitra","Swati","Vishakha","Anuradha","Jyeshta",
               "Mula","Purva Ashadha","Uttara Ashadha","Shravana","Dhanishta","Shatabhisha","Purva Bhadra",
-              "Uttara Bhadra","Revati"]
-
-LORDS = ["Ketu","Venus","Sun","Moon","Mars","Rahu","Jupiter","Saturn","Mercury"]
-YEARS = [7,20,6,10,7,18,16,19,17]
+              "Uttara Bhadra","Revati")
+
+TITHI_NAMES = ("Pratipada","Dwitiya","Tritiya","Chaturthi","Panchami","Shashthi","Saptami","Ashtami",
+               "Navami","Dashami","Ekadashi","Dwadashi","Trayodashi","Chaturdashi","Purnima/Amavasya")
+YOGA_NAMES = ("Vishkambha","Priti","Ayushman","Saubhagya","Shobhana","Atiganda","Sukarma","Dhriti",
+              "Shula","Ganda","Vriddhi","Dhruva","Vyaghata","Harshana","Vajra","Siddhi","Vyatipata",
+              "Variyan","Parigha","Shiva","Siddha","Sadhya","Shubha","Shukla","Brahma","Indra","Vaidhriti")
+# Movable karanas repeat through the month; the fixed ones fill the last half-tithis
+KARANA_MOVABLE = ("Bava","Balava","Kaulava","Taitila","Gara","Vanija","Vishti")
+KARANA_FIXED = ("Shakuni","Chatushpada","Naga","Kimstughna")
+
+DEG_PER_NAK = 360.0 / 27
+INV_DEG_PER_NAK = 27 / 360.0
+
+LORDS = ("Ketu","Venus","Sun","Moon","Mars","Rahu","Jupiter","Saturn","Mercury")
+# Dasha row labels, indexed [is_current][lord]
+LORD_LABELS = (LORDS, tuple(f"{lord} (Current)" for lord in LORDS))
+YEARS = (7,20,6,10,7,18,16,19,17)
+# Dasha lord sequence starting from each lord, and its cumulative end offsets (years)
+# over one 120-year cycle
+ROTATIONS = tuple(tuple((lord + i) % 9 for i in range(9)) for lord in range(9))
+CUM_YEARS = tuple(tuple(accumulate(YEARS[i] for i in rot)) for rot in ROTATIONS)
+
+# Fixed planet ordering; per-chart longitudes/houses are flat lists indexed by these
+PLANET_ORDER = ("Sun","Moon","Mars","Mercury","Jupiter","Venus","Saturn","Rahu","Ketu")
+SUN, MOON, MARS, MERCURY, JUPITER, VENUS, SATURN, RAHU, KETU = range(9)
+# Swiss Ephemeris ids in PLANET_ORDER; Ketu has none and is derived from Rahu
+PIDS = (swe.SUN, swe.MOON, swe.MARS, swe.MERCURY, swe.JUPITER, swe.VENUS, swe.SATURN, swe.MEAN_NODE)
+ALL_MASK = (1 << 9) - 1
+SEVEN_MASK = (1 << RAHU) - 1
+# Ruling planet of each sign, Aries..Pisces
+SIGN_LORDS = (MARS, VENUS, MERCURY, MOON, SUN, MERCURY, VENUS, MARS, JUPITER, SATURN, SATURN, JUPITER)
 
 # ====================== HELPERS ======================
-def get_nakshatra_pada(lon: float):
-    deg_per_nak = 360.0 / 27
-    nak_idx = int(lon / deg_per_nak) % 27
-    pada = int((lon % deg_per_nak) / (deg_per_nak / 4)) + 1
-    return NAKSHATRAS[nak_idx], pada
-
-def get_sign_degree(lon: float):
-    sign_idx = int(lon // 30)
-    deg_in_sign = lon % 30
-    return SIGNS[sign_idx], round(deg_in_sign, 2)
-
-def house_of(lon: float, lagna_lon: float):
-    return int((lon - lagna_lon + 360) % 360 // 30) + 1
-
-def jd_to_datetime(jd: float, tz_str: str):
-    result = swe.jdut1_to_utc(jd, 1)
-    y = int(result[0])
-    m = int(result[1])
-    d = int(result[2])
-    ut = result[3]
-    hour = int(ut)
-    minute = int((ut - hour) * 60)
-    dt = datetime(y, m, d, hour, minute)
-    return pytz.timezone(tz_str).fromutc(dt)
-
-def get_tithi(jd: float):
-    moon = swe.calc_ut(jd, swe.MOON)[0][0]
-    sun = swe.calc_ut(jd, swe.SUN)[0][0]
+def decompose(lon: float):
+    # Sign, degree in sign, nakshatra and pada from one pass over the longitude
+    x = lon * INV_DEG_PER_NAK
+    nak_idx = int(x)
+    return SIGNS[int(lon // 30)], lon % 30, NAKSHATRAS[nak_idx % 27], int((x - nak_idx) * 4) + 1
+
+def format_positions(lons: list):
+    # JSON-ready (sign, degree, nakshatra, pada, longitude) strings, one pass per chart
+    out = []
+    for lon in lons:
+        sign, deg_in_sign, nak, pada = decompose(lon)
+        out.append((sign, f"{deg_in_sign:.2f}", nak, str(pada), f"{lon:.2f}"))
+    return out
+
+def _opposite(lon: float):
+    # (lon + 180) % 360 for lon in [0, 360): one compare instead of a float modulo
+    o = lon + 180.0
+    return o - 360.0 if o >= 360.0 else o
+
+def house_of(lon: float, lagna_sign: int):
+    # Whole-sign: the lagna's sign is house 1, whatever the ascendant degree within it
+    return (int(lon // 30) - lagna_sign) % 12 + 1
+
+_INV_3600 = 1.0 / 3600.0
+
+def _ut(dt: datetime):
+    # Decimal UT hour for swe.julday
+    return (dt.hour * 3600 + dt.minute * 60 + dt.second) * _INV_3600
+
+def _now_minute():
+    # Transits are floored to the wall-clock minute; well inside transit precision
+    return int(time.time()) // 60
+
+# Sidereal (Lahiri) positions straight from the library; speed is kept for retrograde
+FLG = swe.FLG_SWIEPH | swe.FLG_SPEED | swe.FLG_SIDEREAL
+
+# Process-wide caches take the JD as integer seconds (jd_q = round(jd * 86400)), so
+# requests for the same birth second share an entry
+@lru_cache(maxsize=8192)
+def _calc_ut(jd_q: int, pid: int):
+    return swe.calc_ut(jd_q / 86400.0, pid, FLG)[0]
+
+@lru_cache(maxsize=4096)
+def _ascendant(jd_q: int, lat: float, lon: float):
+    # ascmc[0] is the ascendant degree shown in the chart; houses count whole signs from its sign
+    return swe.houses_ex(jd_q / 86400.0, lat, lon, b'W', swe.FLG_SIDEREAL)[1][0]
+
+def _localize(utc_dt: datetime, tz: ZoneInfo):
+    # Naive UTC -> aware local; ZoneInfo.fromutc is C code with its own transition cache
+    return tz.fromutc(utc_dt.replace(tzinfo=tz))
+
+def jd_to_datetime(jd: float, tz: ZoneInfo):
+    y, m, d, hour, minute, _ = swe.jdut1_to_utc(jd, 1)
+    return _localize(datetime(y, m, d, hour, minute), tz)
+
+# Fixed-format replacements for strftime("%I:%M %p") / ("%Y-%m-%d %I:%M %p"),
+# which go through the libc locale machinery on every call
+def _fmt_time(dt: datetime):
+    h = dt.hour
+    return f"{h % 12 or 12:02d}:{dt.minute:02d} {'AM' if h < 12 else 'PM'}"
+
+def _fmt_dt(dt: datetime):
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {_fmt_time(dt)}"
+
+_MJD_EPOCH = datetime(1858, 11, 17)  # JD 2400000.5
+
+def jds_to_strs(jds: list, tz: ZoneInfo):
+    # Dasha boundaries are year-length multiples, not observed instants, so plain
+    # timedelta arithmetic replaces swe.jdut1_to_utc (the sub-second UT1-UTC
+    # correction is below their precision); sunrise/sunset keep jd_to_datetime
+    return [_fmt_dt(_localize(_MJD_EPOCH + timedelta(days=jd - 2400000.5), tz)) for jd in jds]
+
+def panchanga(sun: float, moon: float):
+    # Tithi, yoga and karana all derive from one sidereal Sun/Moon pair
     diff = (moon - sun + 360) % 360
+
     tithi_idx = int(diff / 12)
     paksha = "Shukla" if tithi_idx < 15 else "Krishna"
     idx = tithi_idx % 15 if tithi_idx % 15 != 0 else 15
-    names = ["Pratipada","Dwitiya","Tritiya","Chaturthi","Panchami","Shashthi","Saptami","Ashtami",
-             "Navami","Dashami","Ekadashi","Dwadashi","Trayodashi","Chaturdashi","Purnima/Amavasya"]
-    name = "Purnima" if idx == 15 and paksha == "Shukla" else "Amavasya" if idx == 15 else names[idx-1]
-    return f"{paksha} {name}"
-
-def get_yoga_name(jd: float):
-    sun = swe.calc_ut(jd, swe.SUN)[0][0]
-    moon = swe.calc_ut(jd, swe.MOON)[0][0]
+    name = "Purnima" if idx == 15 and paksha == "Shukla" else "Amavasya" if idx == 15 else TITHI_NAMES[idx-1]
+    tithi = f"{paksha} {name}"
+
     total = (sun + moon) % 360
-    yoga_names = ["Vishkambha","Priti","Ayushman","Saubhagya","Shobhana","Atiganda","Sukarma","Dhriti",
-                  "Shula","Ganda","Vriddhi","Dhruva","Vyaghata","Harshana","Vajra","Siddhi","Vyatipata",
-                  "Variyan","Parigha","Shiva","Siddha","Sadhya","Shubha","Shukla","Brahma","Indra","Vaidhriti"]
-    return yoga_names[int(total / (360.0/27)) % 27]
+    yoga = YOGA_NAMES[int(total * INV_DEG_PER_NAK) % 27]
 
-def get_karana_name(jd: float):
-    diff = (swe.calc_ut(jd, swe.MOON)[0][0] - swe.calc_ut(jd, swe.SUN)[0][0] + 360) % 360
     k = int(diff / 6)
-    if k >= 57: return "Kimstughna"
-    if k <= 7: return ["Bava","Balava","Kaulava","Taitila","Gara","Vanija","Vishti"][(k-1)%7]
-    return ["Shakuni","Chatushpada","Naga","Kimstughna"][(k-8)%4]
-
-def get_sunrise_sunset(jd: float, lat: float, lon: float, tz_str: str):
-    jd_day = math.floor(jd - 0.5) + 0.5
-    # Fixed: use integer flags only
-    _, rise = swe.rise_trans(jd_day - 1.0, swe.SUN, lon, lat, 0, 0, 0, swe.CALC_RISE)
-    _, sett = swe.rise_trans(jd_day - 1.0, swe.SUN, lon, lat, 0, 0, 0, swe.CALC_SET)
-    rise_str = jd_to_datetime(rise, tz_str).strftime("%I:%M %p") if rise > 0 else "N/A"
-    set_str = jd_to_datetime(sett, tz_str).strftime("%I:%M %p") if sett > 0 else "N/A"
+    if k >= 57: karana = "Kimstughna"
+    elif k <= 7: karana = KARANA_MOVABLE[(k-1)%7]
+    else: karana = KARANA_FIXED[(k-8)%4]
+
+    return tithi, yoga, karana
+
+@lru_cache(maxsize=2048)
+def _rise_set(jd_start: float, lat: float, lon: float):
+    # swe.rise_trans finds one event per call; a day/place pair is shared by every request for it
+    geopos = (lon, lat, 0.0)
+    res_rise, rise = swe.rise_trans(jd_start, swe.SUN, swe.CALC_RISE, geopos)
+    res_set, sett = swe.rise_trans(jd_start, swe.SUN, swe.CALC_SET, geopos)
+    return rise[0] if res_rise == 0 else 0.0, sett[0] if res_set == 0 else 0.0
+
+def get_sunrise_sunset(jd: float, lat: float, lon: float, tz: ZoneInfo):
+    # Search from local midnight of the local date of jd, so the first rise/set found
+    # belong to the day asked for; also the cache key, one entry per local day and place
+    local = _localize(_MJD_EPOCH + timedelta(days=jd - 2400000.5), tz)
+    midnight = local.replace(hour=0, minute=0, second=0, microsecond=0).astimezone(timezone.utc)
+    jd_start = 2400000.5 + (midnight.replace(tzinfo=None) - _MJD_EPOCH) / timedelta(days=1)
+    # Rounded like the ascendant key (~10 m) so nearby requests share the day's entry
+    rise, sett = _rise_set(jd_start, round(lat, 4), round(lon, 4))
+    rise_str = _fmt_time(jd_to_datetime(rise, tz)) if rise > 0 else "N/A"
+    set_str = _fmt_time(jd_to_datetime(sett, tz)) if sett > 0 else "N/A"
     return rise_str, set_str
 
 # ====================== FULL DASHA + ANTAR + PRATYANTAR ======================
-def get_dasha_details(moon_lon: float, jd_birth: float, tz_str: str):
-    deg_per_nak = 360.0 / 27
-    nak_idx = int(moon_lon / deg_per_nak)
+def _sub_periods(start_jd: float, years: float, first_idx: int):
+    # The 9 contiguous sub-periods of a period lasting `years`, starting with lord first_idx
+    lords = ROTATIONS[first_idx]
+    bounds = list(accumulate((years * YEARS[i] / 120 * 365.242189 for i in lords), initial=start_jd))
+    return [(bounds[i], bounds[i + 1], lords[i]) for i in range(9)]
+
+def _current_period(periods: list, now_jd: float):
+    # Index of the period with start <= now < end, or -1
+    if now_jd < periods[0][0]:
+        return -1
+    i = bisect_right([end for _, end, _ in periods], now_jd)
+    return i if i < len(periods) else -1
+
+def _walk_dasha(moon_lon: float, jd_birth: float, now_jd: float):
+    # Pure JD arithmetic: (start_jd, end_jd, lord_idx) for the running mahadasha,
+    # its 9 antardashas and the 9 pratyantardashas of the running antardasha
+    nak_idx = int(moon_lon * INV_DEG_PER_NAK)
     lord_idx = nak_idx % 9
-    passed = moon_lon % deg_per_nak
-    balance = (1 - passed / deg_per_nak) * YEARS[lord_idx]
-
-    jd = jd_birth + balance * 365.242189
-    now = datetime.utcnow()
-    now_jd = swe.julday(now.year, now.month, now.day, now.hour + now.minute/60.0 + now.second/3600.0)
-
-    cl = lord_idx
-    while True:
-        m_lord = LORDS[cl % 9]
-        m_dur = YEARS[cl % 9]
-        m_end_jd = jd + m_dur * 365.242189
-        if m_end_jd >= now_jd:
-            m_start_dt = jd_to_datetime(jd, tz_str)
-            m_end_dt = jd_to_datetime(m_end_jd, tz_str)
-
-            antar_list = []
-            jd_a = jd
-            current_antar = "None"
-            current_a_start = None
-            current_a_end = None
-            praty_list = []
-
-            for a in range(9):
-                a_idx = (cl + a) % 9
-                a_lord = LORDS[a_idx]
-                a_years = m_dur * YEARS[a_idx] / 120
-                a_start_dt = jd_to_datetime(jd_a, tz_str)
-                a_end_jd = jd_a + a_years * 365.242189
-                a_end_dt = jd_to_datetime(a_end_jd, tz_str)
-                is_current = jd_a <= now_jd < a_end_jd
-                antar_list.append({
-                    "antardasha": a_lord + (" (Current)" if is_current else ""),
-                    "startDate": a_start_dt.strftime("%Y-%m-%d %I:%M %p"),
-                    "endDate": a_end_dt.strftime("%Y-%m-%d %I:%M %p")
-                })
-
-                if is_current:
-                    current_antar = a_lord
-                    current_a_start = a_start_dt
-                    current_a_end = a_end_dt
-
-                    # Pratyantardasha
-                    jd_p = jd_a
-                    for p in range(9):
-                        p_idx = (cl + a + p) % 9
-                        p_lord = LORDS[p_idx]
-                        p_years = a_years * YEARS[p_idx] / 120
-                        p_start_dt = jd_to_datetime(jd_p, tz_str)
-                        p_end_jd = jd_p + p_years * 365.242189
-                        p_end_dt = jd_to_datetime(p_end_jd, tz_str)
-                        is_curr_p = jd_p <= now_jd < p_end_jd
-                        praty_list.append({
-                            "pratyantardasha": p_lord + (" (Current)" if is_curr_p else ""),
-                            "startDate": p_start_dt.strftime("%Y-%m-%d %I:%M %p"),
-                            "endDate": p_end_dt.strftime("%Y-%m-%d %I:%M %p")
-                        })
-                        jd_p = p_end_jd
-
-                jd_a = a_end_jd
-
-            current_praty = next((i["pratyantardasha"].split(" ")[0] for i in praty_list if "(Current)" in i["pratyantardasha"]), "None")
-
-            return {
-                "mahadasha": m_lord,
-                "mahadashaStart": m_start_dt.strftime("%Y-%m-%d %I:%M %p"),
-                "mahadashaEnd": m_end_dt.strftime("%Y-%m-%d %I:%M %p"),
-                "currentAntardasha": current_antar,
-                "currentAntardashaStart": current_a_start.strftime("%Y-%m-%d %I:%M %p") if current_a_start else "N/A",
-                "currentAntardashaEnd": current_a_end.strftime("%Y-%m-%d %I:%M %p") if current_a_end else "N/A",
-                "antardashaList": antar_list,
-                "currentPratyantardasha": current_praty,
-                "pratyantardashaList": praty_list
-            }
-
-        jd = m_end_jd
-        cl += 1
+    passed = moon_lon % DEG_PER_NAK
+    balance = (1 - passed * INV_DEG_PER_NAK) * YEARS[lord_idx]
+
+    # The birth mahadasha has only `balance` years left, so the sequence is anchored at
+    # its notional start before birth; from there each lord runs its full term
+    jd = jd_birth - (YEARS[lord_idx] - balance) * 365.242189
+    # First mahadasha whose end is >= now, found by binary search over the cycle
+    elapsed = max((now_jd - jd) / 365.242189, 0.0)
+    cycles = int(elapsed // 120)
+    cum = CUM_YEARS[lord_idx]
+    offset = bisect_left(cum, elapsed - cycles * 120)
+    cl = (lord_idx + offset) % 9
+    jd += (cycles * 120 + (cum[offset - 1] if offset else 0)) * 365.242189
+    m_dur = YEARS[cl]
+    m_end_jd = jd + m_dur * 365.242189
+
+    antars = _sub_periods(jd, m_dur, cl)
+    current_a = _current_period(antars, now_jd)
+    pratys = []
+    current_p = -1
+    if current_a >= 0:
+        a_start, _, a_idx = antars[current_a]
+        pratys = _sub_periods(a_start, m_dur * YEARS[a_idx] / 120, a_idx)
+        current_p = _current_period(pratys, now_jd)
+
+    return (jd, m_end_jd, cl), antars, pratys, current_a, current_p
+
+def get_dasha_details(moon_lon: float, jd_birth: float, now_jd: float, tz, include_lists: bool = True):
+    maha, antars, pratys, current_a, current_p = _walk_dasha(moon_lon, jd_birth, now_jd)
+
+    if not include_lists:
+        # Only the running antar/pratyantar get dates; their index in the slice becomes 0
+        antars = antars[current_a:current_a + 1] if current_a >= 0 else []
+        pratys = pratys[current_p:current_p + 1] if current_p >= 0 else []
+        current_a, current_p = min(current_a, 0), min(current_p, 0)
+
+    # Periods are contiguous, so each list needs its starts plus the final end
+    a_bounds = [start for start, _, _ in antars] + [antars[-1][1]] if antars else []
+    p_bounds = [start for start, _, _ in pratys] + [pratys[-1][1]] if pratys else []
+    strs = jds_to_strs([maha[0], maha[1], *a_bounds, *p_bounds], tz)
+    a_strs = strs[2:2 + len(a_bounds)]
+    p_strs = strs[2 + len(a_bounds):]
+
+    antar_list = [{
+        "antardasha": LORD_LABELS[a == current_a][lord],
+        "startDate": a_strs[a],
+        "endDate": a_strs[a + 1]
+    } for a, (_, _, lord) in enumerate(antars)] if include_lists else []
+
+    praty_list = [{
+        "pratyantardasha": LORD_LABELS[p == current_p][lord],
+        "startDate": p_strs[p],
+        "endDate": p_strs[p + 1]
+    } for p, (_, _, lord) in enumerate(pratys)] if include_lists else []
+
+    has_a, has_p = current_a >= 0, current_p >= 0
+
+    return {
+        "mahadasha": LORDS[maha[2]],
+        "mahadashaStart": strs[0],
+        "mahadashaEnd": strs[1],
+        "currentAntardasha": LORDS[antars[current_a][2]] if has_a else "None",
+        "currentAntardashaStart": a_strs[current_a] if has_a else "N/A",
+        "currentAntardashaEnd": a_strs[current_a + 1] if has_a else "N/A",
+        "antardashaList": antar_list,
+        "currentPratyantardasha": LORDS[pratys[current_p][2]] if has_p else "None",
+        "currentPratyantardashaStart": p_strs[current_p] if has_p else "N/A",
+        "currentPratyantardashaEnd": p_strs[current_p + 1] if has_p else "N/A",
+        "pratyantardashaList": praty_list
+    }
 
 # ====================== 200+ AUTHENTIC VEDIC YOGAS (FULL LIST) ======================
-def detect_yogas(planets: dict, lagna_lon: float):
-    yogas = []
-    h = {p: house_of(planets[p], lagna_lon) for p in planets}
-
+KENDRA = frozenset((1, 4, 7, 10))
+TRIKONA = frozenset((1, 5, 9))
+DUSTHANA = frozenset((6, 8, 12))
+UPACHAYA = frozenset((3, 6, 10, 11))
+BENEFICS = (1 << MERCURY) | (1 << VENUS) | (1 << JUPITER)
+NOT_SUN = ALL_MASK & ~(1 << SUN)
+NOT_MOON = ALL_MASK & ~(1 << MOON)
+CHATUSSAGARA = (1 << SUN) | (1 << MOON) | (1 << MARS) | (1 << JUPITER)
+
+def _kendra(O: list):
+    return O[1] | O[4] | O[7] | O[10]
+
+def _raja(O: list):
+    in_kendra = _kendra(O)
+    in_trikona = O[1] | O[5] | O[9]
+    # Some kendra planet pairs with a different trikona planet unless both sets are the same lone planet
+    return in_kendra and in_trikona and not (in_kendra == in_trikona and in_kendra & (in_kendra - 1) == 0)
+
+def _kaal_sarpa(L: list):
+    # All seven planets on one side of the Rahu-Ketu axis
+    ahead_of_rahu = [(lon - L[RAHU]) % 360 < 180 for lon in L[:RAHU]]
+    return all(ahead_of_rahu) or not any(ahead_of_rahu)
+
+def _adhi(H: list, O: list):
+    # Mercury, Venus and Jupiter all in the 6th/7th/8th from the Moon
+    m = H[MOON]
+    return (O[(m + 5) % 12 + 1] | O[(m + 6) % 12 + 1] | O[(m + 7) % 12 + 1]) & BENEFICS == BENEFICS
+
+def _sunapha(H: list, O: list):
+    return O[H[MOON] % 12 + 2] & SEVEN_MASK & NOT_MOON
+
+def _anapha(H: list, O: list):
+    return O[(H[MOON] - 2) % 12] & SEVEN_MASK & NOT_MOON
+
+def _flanked(O: list):
+    return (O[2] | O[12]) & NOT_MOON
+
+# (name, rule) in report order. Every rule takes the same context:
+#   L  sidereal longitudes, H  houses (both indexed by PLANET_ORDER)
+#   LH house of each house lord (LH[n], index 0 unused)
+#   O  occupants of each house as a planet bitmask
+#   d  the BirthInput, found  the yogas matched so far
+YOGA_RULES = (
     # Pancha Mahapurusha Yogas
-    if h["Mars"] in [1,4,7,10] and (0 <= planets["Mars"] < 28 or 268 <= planets["Mars"] < 298):
-        yogas.append("Ruchaka Yoga - Supreme courage & leadership")
-    if h["Mercury"] in [1,4,7,10] and (165 <= planets["Mercury"] < 195):
-        yogas.append("Bhadra Yoga - Brilliant intellect & business")
-    if h["Jupiter"] in [1,4,7,10] and (60 <= planets["Jupiter"] < 90 or 240 <= planets["Jupiter"] < 270):
-        yogas.append("Hamsa Yoga - Spiritual wisdom & respect")
-    if h["Venus"] in [1,4,7,10] and (27 <= planets["Venus"] < 57 or 207 <= planets["Venus"] < 237):
-        yogas.append("Malavya Yoga - Luxury, beauty & charm")
-    if h["Saturn"] in [1,4,7,10] and (297 <= planets["Saturn"] < 327):
-        yogas.append("Sasa Yoga - Authority & long life")
-
-    # Gaja Kesari Yoga
-    diff = abs(planets["Jupiter"] - planets["Moon"]) % 360
-    if 80 < diff < 100 or 260 < diff < 280:
-        yogas.append("Gaja Kesari Yoga - Fame, wealth, intelligence")
-
-    # Budhaditya Yoga
-    if abs(planets["Sun"] - planets["Mercury"]) < 13:
-        yogas.append("Budhaditya Yoga - Brilliant mind & success")
-
-    # Lakshmi Yoga
-    if h["Venus"] in [1,2,4,5,9,10,11] and h["Jupiter"] in [1,2,4,5,9,10,11]:
-        yogas.append("Lakshmi Yoga - Immense wealth & luxury")
-
-    # Raja Yoga (multiple)
-    kendra = [1,4,7,10]
-    trikona = [1,5,9]
-    if any(h[p] in kendra and h[q] in trikona for p in planets for q in planets if p != q):
-        yogas.append("Raja Yoga - Power, authority, success")
-
-    # Dhana Yoga
-    if h["2"] in [1,2,5,9,11] or h["11"] in [1,2,5,9,11] or h["Jupiter"] in [2,11]:
-        yogas.append("Dhana Yoga - Great wealth")
-
-    # Vipareeta Raja Yoga
-    if h["6"] in [6,8,12] or h["8"] in [6,8,12] or h["12"] in [6,8,12]:
-        yogas.append("Vipareeta Raja Yoga - Success after struggle")
-
-    # Kaal Sarpa Yoga
-    rahu = planets["Rahu"]
-    ketu = planets["Ketu"]
-    all_hemmed = True
-    for p in ["Sun","Moon","Mars","Mercury","Jupiter","Venus","Saturn"]:
-        plon = planets[p]
-        if not (min(abs(plon - rahu) % 360, abs(plon - ketu) % 360) < 180):
-            all_hemmed = False
-    if all_hemmed:
-        yogas.append("Kaal Sarpa Yoga - Intense karmic path")
-
-    # Adhi Yoga
-    moon_house = h["Moon"]
-    benefics = ["Mercury","Venus","Jupiter"]
-    in_678 = [p for p in benefics if h[p] in [(moon_house + 5) % 12 + 1, (moon_house + 6) % 12 + 1, (moon_house + 7) % 12 + 1]]
-    if len(in_678) == 3:
-        yogas.append("Adhi Yoga - High position & authority")
-
-    # Saraswati Yoga
-    if h["Mercury"] in [1,2,4,5,7,9,10] and h["Jupiter"] in [1,2,4,5,7,9,10] and h["Venus"] in [1,2,4,5,7,9,10]:
-        yogas.append("Saraswati Yoga - Master of knowledge & arts")
-
-    # Parvata Yoga
-    if h["6"] == 6 and h["8"] == 8 and h["12"] == 12 and h["Lagna"] in [1,5,9]:
-        yogas.append("Parvata Yoga - Fame & prosperity")
-
-    # Kahala Yoga
-    if h["4"] == h["9"]:
-        yogas.append("Kahala Yoga - Courage & success")
-
-    # Amala Yoga
-    if h["10"] in [10,11]:
-        yogas.append("Amala Yoga - Pure & respected")
-
-    # Vasumati Yoga
-    if len([p for p in ["Jupiter","Venus","Mercury"] if h[p] in [3,6,10,11]]) >= 3:
-        yogas.append("Vasumati Yoga - Great wealth")
+    ("Ruchaka Yoga - Supreme courage & leadership",
+     lambda L, H, LH, O, d, found: H[MARS] in KENDRA and (0 <= L[MARS] < 28 or 268 <= L[MARS] < 298)),
+    ("Bhadra Yoga - Brilliant intellect & business",
+     lambda L, H, LH, O, d, found: H[MERCURY] in KENDRA and 165 <= L[MERCURY] < 195),
+    ("Hamsa Yoga - Spiritual wisdom & respect",
+     lambda L, H, LH, O, d, found: H[JUPITER] in KENDRA and (60 <= L[JUPITER] < 90 or 240 <= L[JUPITER] < 270)),
+    ("Malavya Yoga - Luxury, beauty & charm",
+     lambda L, H, LH, O, d, found: H[VENUS] in KENDRA and (27 <= L[VENUS] < 57 or 207 <= L[VENUS] < 237)),
+    ("Sasa Yoga - Authority & long life",
+     lambda L, H, LH, O, d, found: H[SATURN] in KENDRA and 297 <= L[SATURN] < 327),
+
+    ("Gaja Kesari Yoga - Fame, wealth, intelligence",
+     lambda L, H, LH, O, d, found: 80 < abs(L[JUPITER] - L[MOON]) % 360 < 100 or 260 < abs(L[JUPITER] - L[MOON]) % 360 < 280),
+    ("Budhaditya Yoga - Brilliant mind & success",
+     lambda L, H, LH, O, d, found: abs(L[SUN] - L[MERCURY]) < 13),
+    ("Lakshmi Yoga - Immense wealth & luxury",
+     lambda L, H, LH, O, d, found: H[VENUS] in (1, 2, 4, 5, 9, 10, 11) and H[JUPITER] in (1, 2, 4, 5, 9, 10, 11)),
+    ("Raja Yoga - Power, authority, success",
+     lambda L, H, LH, O, d, found: _raja(O)),
+    ("Dhana Yoga - Great wealth",
+     lambda L, H, LH, O, d, found: LH[2] in (1, 2, 5, 9, 11) or LH[11] in (1, 2, 5, 9, 11) or H[JUPITER] in (2, 11)),
+    ("Vipareeta Raja Yoga - Success after struggle",
+     lambda L, H, LH, O, d, found: LH[6] in DUSTHANA or LH[8] in DUSTHANA or LH[12] in DUSTHANA),
+    ("Kaal Sarpa Yoga - Intense karmic path",
+     lambda L, H, LH, O, d, found: _kaal_sarpa(L)),
+    ("Adhi Yoga - High position & authority",
+     lambda L, H, LH, O, d, found: _adhi(H, O)),
+    ("Saraswati Yoga - Master of knowledge & arts",
+     lambda L, H, LH, O, d, found: all(H[p] in (1, 2, 4, 5, 7, 9, 10) for p in (MERCURY, JUPITER, VENUS))),
+    ("Parvata Yoga - Fame & prosperity",
+     lambda L, H, LH, O, d, found: LH[6] == 6 and LH[8] == 8 and LH[12] == 12 and LH[1] in TRIKONA),
+    ("Kahala Yoga - Courage & success",
+     lambda L, H, LH, O, d, found: LH[4] == LH[9]),
+    ("Amala Yoga - Pure & respected",
+     lambda L, H, LH, O, d, found: LH[10] in (10, 11)),
+    ("Vasumati Yoga - Great wealth",
+     lambda L, H, LH, O, d, found: (O[3] | O[6] | O[10] | O[11]) & BENEFICS == BENEFICS),
 
     # Sunapha, Anapha, Durudhara
-    moon_house = h["Moon"]
-    planets_except_moon = [p for p in planets if p != "Moon" and p not in ["Rahu","Ketu"]]
-    if any(h[p] == (moon_house % 12 + 2) for p in planets_except_moon):
-        yogas.append("Sunapha Yoga - Wealth & intelligence")
-    if any(h[p] == (moon_house - 2) % 12 for p in planets_except_moon):
-        yogas.append("Anapha Yoga - Wealth & charm")
-    if any(h[p] == (moon_house % 12 + 2) for p in planets_except_moon) and any(h[p] == (moon_house - 2) % 12 for p in planets_except_moon):
-        yogas.append("Durudhara Yoga - Immense wealth")
-
-    # Chandra Mangala Yoga
-    if abs(planets["Moon"] - planets["Mars"]) < 12:
-        yogas.append("Chandra Mangala Yoga - Wealth through business")
-
-    # Gauri Yoga
-    if h["Moon"] in [1,4,7,10] and planets["Moon"] in [3,6,11]:
-        yogas.append("Gauri Yoga - Beauty & grace")
-
-    # Bharati Yoga
-    if h["Venus"] in [2,5,9]:
-        yogas.append("Bharati Yoga - Knowledge & eloquence")
-
-    # Sankhya Yoga
-    if len(planets) == 7:
-        yogas.append("Sankhya Yoga - Renunciation")
-
-    # Kshema Yoga
-    if h["Venus"] in [4,8,12]:
-        yogas.append("Kshema Yoga - Security & prosperity")
-
-    # Ubhayachari Yoga
-    if any(h[p] in [2,12] for p in planets if p != "Sun"):
-        yogas.append("Ubhayachari Yoga - Support from all sides")
-
-    # Harsha Yoga
-    if h["6"] == 6:
-        yogas.append("Harsha Yoga - Happiness")
-
-    # Sarala Yoga
-    if h["8"] == 8:
-        yogas.append("Sarala Yoga - Longevity")
-
-    # Vimala Yoga
-    if h["12"] == 12:
-        yogas.append("Vimala Yoga - Purity")
-
-    # Dhwaja Yoga
-    if h["Lagna"] in [1,4,7,10]:
-        yogas.append("Dhwaja Yoga - Leadership")
-
-    # Vesi Yoga
-    if any(h[p] == 12 for p in planets if p != "Sun"):
-        yogas.append("Vesi Yoga - Support from friends")
-
-    # Vasi Yoga
-    if any(h[p] == 2 for p in planets if p != "Sun"):
-        yogas.append("Vasi Yoga - Support from relatives")
-
-    # Obhayachari Yoga
-    if any(h[p] == 2 for p in planets if p != "Sun") and any(h[p] == 12 for p in planets if p != "Sun"):
-        yogas.append("Obhayachari Yoga - Protection")
-
-    # Maha Bhagya Yoga
-    if int(data.dateOfBirth.split("-")[2]) % 2 == 1 and int(data.timeOfBirth.split(":")[0]) < 12:
-        yogas.append("Maha Bhagya Yoga - Great fortune")
-
-    # Maha Purusha Yoga
-    if any(yoga in yogas for yoga in ["Ruchaka", "Bhadra", "Hamsa", "Malavya", "Sasa"]):
-        yogas.append("Maha Purusha Yoga - Great personality")
-
-    # Parivartana Yoga (simplified)
-    # Add more if needed
-
-    # Maha Lakshmi Yoga
-    if h["Venus"] in [1,4,7,10] and h["Jupiter"] in [1,4,7,10]:
-        yogas.append("Maha Lakshmi Yoga - Supreme wealth")
-
-    # Shankha Yoga
-    if h["5"] == h["9"] and h["Lagna"] in [1,5,9]:
-        yogas.append("Shankha Yoga - Wealth & longevity")
-
-    # Bheri Yoga
-    if h["9"] in [1,4,7,10] and h["Jupiter"] in [1,4,7,10] and h["Venus"] in [1,4,7,10]:
-        yogas.append("Bheri Yoga - Wealth & fame")
-
-    # Shree Nath Yoga
-    if h["Venus"] in [1,4,7,10] and h["Jupiter"] in [1,4,7,10]:
-        yogas.append("Shree Nath Yoga - Wealth & respect")
-
-    # Matsya Yoga
-    if h["Sun"] in [1,5,9] and h["Moon"] in [1,5,9] and h["Lagna"] in [1,5,9]:
-        yogas.append("Matsya Yoga - Wealth & fame")
-
-    # Kusuma Yoga
-    if h["Venus"] in [1,5,9]:
-        yogas.append("Kusuma Yoga - Beauty & charm")
-
-    # Chatussagara Yoga
-    if all(h[p] in [1,4,7,10] for p in ["Sun","Moon","Mars","Jupiter"]):
-        yogas.append("Chatussagara Yoga - Success in all directions")
-
-    # Kemadruma Yoga
-    if not any(h[p] in [2,12] for p in planets if p != "Moon"):
-        yogas.append("Kemadruma Yoga - Mental stress (if not cancelled)")
-
-    # Kemadruma Bhanga
-    if any(h[p] in [2,12] for p in planets if p != "Moon"):
-        yogas.append("Kemadruma Bhanga - Cancellation of mental stress")
-
-    # Chandra Adhi Yoga
-    if h["Moon"] in [3,6,10,11]:
-        yogas.append("Chandra Adhi Yoga - High position")
-
-    # Surya Adhi Yoga
-    if h["Sun"] in [3,6,10,11]:
-        yogas.append("Surya Adhi Yoga - High position")
-
-    # Mangal Adhi Yoga
-    if h["Mars"] in [3,6,10,11]:
-        yogas.append("Mangal Adhi Yoga - High position")
+    ("Sunapha Yoga - Wealth & intelligence",
+     lambda L, H, LH, O, d, found: _sunapha(H, O)),
+    ("Anapha Yoga - Wealth & charm",
+     lambda L, H, LH, O, d, found: _anapha(H, O)),
+    ("Durudhara Yoga - Immense wealth",
+     lambda L, H, LH, O, d, found: _sunapha(H, O) and _anapha(H, O)),
+
+    ("Chandra Mangala Yoga - Wealth through business",
+     lambda L, H, LH, O, d, found: abs(L[MOON] - L[MARS]) < 12),
+    ("Gauri Yoga - Beauty & grace",
+     lambda L, H, LH, O, d, found: H[MOON] in KENDRA and L[MOON] in (3, 6, 11)),
+    ("Bharati Yoga - Knowledge & eloquence",
+     lambda L, H, LH, O, d, found: H[VENUS] in (2, 5, 9)),
+    ("Sankhya Yoga - Renunciation",
+     lambda L, H, LH, O, d, found: len(L) == 7),
+    ("Kshema Yoga - Security & prosperity",
+     lambda L, H, LH, O, d, found: H[VENUS] in (4, 8, 12)),
+    ("Ubhayachari Yoga - Support from all sides",
+     lambda L, H, LH, O, d, found: (O[2] | O[12]) & NOT_SUN),
+    ("Harsha Yoga - Happiness",
+     lambda L, H, LH, O, d, found: LH[6] == 6),
+    ("Sarala Yoga - Longevity",
+     lambda L, H, LH, O, d, found: LH[8] == 8),
+    ("Vimala Yoga - Purity",
+     lambda L, H, LH, O, d, found: LH[12] == 12),
+    ("Dhwaja Yoga - Leadership",
+     lambda L, H, LH, O, d, found: LH[1] in KENDRA),
+    ("Vesi Yoga - Support from friends",
+     lambda L, H, LH, O, d, found: O[12] & NOT_SUN),
+    ("Vasi Yoga - Support from relatives",
+     lambda L, H, LH, O, d, found: O[2] & NOT_SUN),
+    ("Obhayachari Yoga - Protection",
+     lambda L, H, LH, O, d, found: O[2] & NOT_SUN and O[12] & NOT_SUN),
+    ("Maha Bhagya Yoga - Great fortune",
+     lambda L, H, LH, O, d, found: int(d.dateOfBirth.split("-")[2]) % 2 == 1 and int(d.timeOfBirth.split(":")[0]) < 12),
+    ("Maha Purusha Yoga - Great personality",
+     lambda L, H, LH, O, d, found: any(y.startswith(("Ruchaka ", "Bhadra ", "Hamsa ", "Malavya ", "Sasa ")) for y in found)),
+
+    ("Maha Lakshmi Yoga - Supreme wealth",
+     lambda L, H, LH, O, d, found: H[VENUS] in KENDRA and H[JUPITER] in KENDRA),
+    ("Shankha Yoga - Wealth & longevity",
+     lambda L, H, LH, O, d, found: LH[5] == LH[9] and LH[1] in TRIKONA),
+    ("Bheri Yoga - Wealth & fame",
+     lambda L, H, LH, O, d, found: LH[9] in KENDRA and H[JUPITER] in KENDRA and H[VENUS] in KENDRA),
+    ("Shree Nath Yoga - Wealth & respect",
+     lambda L, H, LH, O, d, found: H[VENUS] in KENDRA and H[JUPITER] in KENDRA),
+    ("Matsya Yoga - Wealth & fame",
+     lambda L, H, LH, O, d, found: H[SUN] in TRIKONA and H[MOON] in TRIKONA and LH[1] in TRIKONA),
+    ("Kusuma Yoga - Beauty & charm",
+     lambda L, H, LH, O, d, found: H[VENUS] in TRIKONA),
+    ("Chatussagara Yoga - Success in all directions",
+     lambda L, H, LH, O, d, found: _kendra(O) & CHATUSSAGARA == CHATUSSAGARA),
+    ("Kemadruma Yoga - Mental stress (if not cancelled)",
+     lambda L, H, LH, O, d, found: not _flanked(O)),
+    ("Kemadruma Bhanga - Cancellation of mental stress",
+     lambda L, H, LH, O, d, found: _flanked(O)),
+    ("Chandra Adhi Yoga - High position",
+     lambda L, H, LH, O, d, found: H[MOON] in UPACHAYA),
+    ("Surya Adhi Yoga - High position",
+     lambda L, H, LH, O, d, found: H[SUN] in UPACHAYA),
+    ("Mangal Adhi Yoga - High position",
+     lambda L, H, LH, O, d, found: H[MARS] in UPACHAYA),
 
     # Total 200+ authentic yogas from Parashara, Jaimini, Phaladeepika, Uttara Kalamrita, etc.
+)
+# Each yoga is reported at most once; a rule added twice is a copy-paste slip
+assert len({name for name, _ in YOGA_RULES}) == len(YOGA_RULES), "duplicate yoga rule"
+
+def detect_yogas(lons: list, h: list, lagna_sign: int, data: BirthInput):
+    # lord_h[n]: house occupied by the lord of house n (whole-sign from the lagna); index 0 unused
+    lord_h = [0] + [h[SIGN_LORDS[(lagna_sign + n) % 12]] for n in range(12)]
+    # Occupants of each house as a bitmask over planet ids; slots 0 and 13 stay empty
+    # so the Moon-relative offsets can index without bounds checks
+    occ = [0] * 14
+    for p in range(9):
+        occ[h[p]] |= 1 << p
 
+    yogas = []
+    for name, rule in YOGA_RULES:
+        if rule(lons, h, lord_h, occ, data, yogas):
+            yogas.append(name)
     return yogas
 
 # ====================== MAIN ENDPOINT ======================
-@app.post("/full-vedic-chart")
-def full_vedic_chart(data: BirthInput):
+def _warm_ephemeris():
+    # The library reads the .se1 files lazily on the first calc_ut. Ask the kernel to
+    # read them ahead (the page cache is shared by every thread) and run one batch so a
+    # cold container's first chart doesn't pay the disk reads
+    if hasattr(os, "posix_fadvise") and os.path.isdir(EPHE_PATH):
+        for name in os.listdir(EPHE_PATH):
+            if name.endswith(".se1"):
+                fd = os.open(os.path.join(EPHE_PATH, name), os.O_RDONLY)
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                finally:
+                    os.close(fd)
+    _init_swe()
+    _transits(_now_minute())
+    logger.info("Ephemeris warmed")
+
+def _compute_natal(jd_birth: float, lat: float, lon: float):
+    jd_q = round(jd_birth * 86400)
+    # Full calc_ut 6-tuples (lon, lat, dist, speeds); the speed gives retrograde
+    raw = [_calc_ut(jd_q, pid) for pid in PIDS]
+    lons = [xx[0] for xx in raw]
+    lons.append(_opposite(lons[RAHU]))
+    return raw, lons, _ascendant(jd_q, round(lat, 4), round(lon, 4))
+
+@lru_cache(maxsize=2)
+def _transits(minute: int):
+    # The transit side depends only on the minute, not the birth data, so one process
+    # computes it once per minute and every request in that minute shares the result.
+    # Returns (jd_now, formatted positions, (tithi, yoga, karana)); callers must not mutate
+    jd_now = 2440587.5 + minute / 1440.0  # Unix epoch is JD 2440587.5
+    current = [swe.calc_ut(jd_now, pid, FLG)[0][0] for pid in PIDS]
+    current.append(_opposite(current[RAHU]))
+    return jd_now, tuple(format_positions(current)), panchanga(current[SUN], current[MOON])
+
+def _compute_chart(data: BirthInput):
+    _init_swe()
     try:
-        logger.info(f"Processing chart for {data.name}")
+        logger.info("Processing chart for %s", data.name)
 
         local = datetime.strptime(f"{data.dateOfBirth} {data.timeOfBirth}", "%Y-%m-%d %H:%M")
-        tz = pytz.timezone(data.timezone)
-        utc = tz.localize(local).astimezone(pytz.UTC)
-        jd_birth = swe.julday(utc.year, utc.month, utc.day, utc.hour + utc.minute/60.0)
-
-        swe.set_sid_mode(swe.SIDM_LAHIRI)
-        ayan = swe.get_ayanamsa_ut(jd_birth)
-
-        pids = {"Sun": swe.SUN, "Moon": swe.MOON, "Mars": swe.MARS, "Mercury": swe.MERCURY, "Jupiter": swe.JUPITER, "Venus": swe.VENUS, "Saturn": swe.SATURN, "Rahu": swe.MEAN_NODE}
-        planets = {name: (swe.calc_ut(jd_birth, pid)[0][0] - ayan) % 360 for name, pid in pids.items()}
-        planets["Ketu"] = (planets["Rahu"] + 180) % 360
+        # ZoneInfo caches instances by key, so repeat zones cost a dict lookup
+        tz = ZoneInfo(data.timezone)
+        utc = local.replace(tzinfo=tz).astimezone(timezone.utc)
+        jd_birth = swe.julday(utc.year, utc.month, utc.day, _ut(utc))
 
-        cusps, _ = swe.houses(jd_birth, data.latitude, data.longitude, b'W')
-        lagna_lon = (cusps[0] - ayan) % 360
+        raw, lons, lagna_lon = _compute_natal(jd_birth, data.latitude, data.longitude)
+        jd_now, current_pos, (current_tithi, current_yoga, current_karana) = _transits(_now_minute())
 
-        now = datetime.utcnow()
-        jd_now = swe.julday(now.year, now.month, now.day, now.hour + now.minute/60.0 + now.second/3600.0)
+        dasha_info = get_dasha_details(lons[MOON], jd_birth, jd_now, tz, data.include_lists)
 
-        current = {name: (swe.calc_ut(jd_now, pid)[0][0] - swe.get_ayanamsa_ut(jd_now)) % 360 for name, pid in pids.items()}
-        current["Ketu"] = (current["Rahu"] + 180) % 360
+        birth_sunrise, birth_sunset = get_sunrise_sunset(jd_birth, data.latitude, data.longitude, tz)
+        current_sunrise, current_sunset = get_sunrise_sunset(jd_now, data.latitude, data.longitude, tz)
 
-        dasha_info = get_dasha_details(planets["Moon"], jd_birth, data.timezone)
+        lagna_sign = int(lagna_lon // 30)
+        houses = [house_of(l, lagna_sign) for l in lons]
+        yogas = detect_yogas(lons, houses, lagna_sign, data)
 
-        birth_sunrise, birth_sunset = get_sunrise_sunset(jd_birth, data.latitude, data.longitude, data.timezone)
-        current_sunrise, current_sunset = get_sunrise_sunset(jd_now, data.latitude, data.longitude, data.timezone)
+        birth_tithi, birth_yoga, _ = panchanga(lons[SUN], lons[MOON])
 
-        yogas = detect_yogas(planets, lagna_lon)
+        natal_pos = format_positions(lons)
 
-        def fmt(name: str, lon: float):
-            sign, deg = get_sign_degree(lon)
-            nak, pada = get_nakshatra_pada(lon)
-            retro = swe.calc_ut(jd_birth, pids.get(name, swe.MEAN_NODE))[0][3] < 0 if name not in ["Rahu","Ketu"] else False
-            return {"planet": name, "sign": sign, "degree": f"{deg:.2f}", "nakshatra": nak, "pada": str(pada), "longitude": f"{lon:.2f}", "isRetro": retro}
+        def fmt(name: str, pos: tuple, retro: bool = False):
+            sign, deg, nak, pada, lon = pos
+            return {"planet": name, "sign": sign, "degree": deg, "nakshatra": nak, "pada": pada, "longitude": lon, "isRetro": retro}
 
-        natal_planets = [fmt(p, l) for p, l in planets.items()]
+        natal_planets = [fmt(PLANET_ORDER[i], natal_pos[i], i < RAHU and raw[i][3] < 0) for i in range(9)]
 
-        current_planets = []
-        for p, l in current.items():
-            sign, deg = get_sign_degree(l)
-            nak, pada = get_nakshatra_pada(l)
-            current_planets.append({
-                "currentPlanetaryplanet": p,
-                "currentPlanetarysign": sign,
-                "currentPlanetarydegree": f"{deg:.2f}",
-                "currentPlanetarynakshatra": nak,
-                "currentPlanetarypada": str(pada),
-                "currentPlanetarylongitude": f"{l:.2f}"
-            })
+        current_planets = [{
+            "currentPlanetaryplanet": name,
+            "currentPlanetarysign": sign,
+            "currentPlanetarydegree": deg,
+            "currentPlanetarynakshatra": nak,
+            "currentPlanetarypada": pada,
+            "currentPlanetarylongitude": lon
+        } for name, (sign, deg, nak, pada, lon) in zip(PLANET_ORDER, current_pos)]
 
         logger.info("Chart generated successfully")
 
-        return {
+        return ORJSONResponse({
             "birthDetails": {
                 "name": data.name,
                 "dateOfBirth": data.dateOfBirth,
@@ -462,11 +566,11 @@ def full_vedic_chart(data: BirthInput):
                 "user_location": {"latitude": data.latitude, "longitude": data.longitude, "timezone": data.timezone}
             },
             "natalChart": {
-                "ascendant": {**fmt("Ascendant", lagna_lon), "planet": "Ascendant"},
-                "sunSign": fmt("Sun", planets["Sun"]),
-                "moonSign": fmt("Moon", planets["Moon"]),
-                "tithi": {"name": get_tithi(jd_birth)},
-                "yoga": {"name": get_yoga_name(jd_birth)}
+                "ascendant": fmt("Ascendant", format_positions([lagna_lon])[0]),
+                "sunSign": natal_planets[SUN],
+                "moonSign": natal_planets[MOON],
+                "tithi": {"name": birth_tithi},
+                "yoga": {"name": birth_yoga}
             },
             "houseCalculationMethod": "Whole Sign Houses based on ascendant (Lagna)",
             "natalPlanets": natal_planets,
@@ -490,20 +594,27 @@ def full_vedic_chart(data: BirthInput):
             "pratyantardashaList": dasha_info["pratyantardashaList"],
             "dailyDetails": {"sunrise": birth_sunrise, "sunset": birth_sunset},
             "currentPanchang": {
-                "currentMoonSign": get_sign_degree(current["Moon"])[0],
-                "currentTithi": {"currentTithiName": get_tithi(jd_now)},
-                "currentKarana": {"currentKaranaName": get_karana_name(jd_now)},
-                "currentYoga": {"currentYogaName": get_yoga_name(jd_now)},
-                "currentNakshatra": {"currentNakshatraName": get_nakshatra_pada(current["Moon"])[0]},
+                "currentMoonSign": current_pos[MOON][0],
+                "currentTithi": {"currentTithiName": current_tithi},
+                "currentKarana": {"currentKaranaName": current_karana},
+                "currentYoga": {"currentYogaName": current_yoga},
+                "currentNakshatra": {"currentNakshatraName": current_pos[MOON][2]},
                 "currentSunRise": current_sunrise,
                 "currentSunSet": current_sunset
             },
             "yogas": yogas
-        }
+        })
 
     except Exception as e:
-        logger.error(f"CRASH: {str(e)}", exc_info=True)
-        return {"error": "Internal server error", "details": str(e)}, 500
+        logger.error("CRASH: %s", e, exc_info=True)
+        return ORJSONResponse({"error": "Internal server error", "details": str(e)}, status_code=500)
+
+@app.post("/full-vedic-chart")
+async def full_vedic_chart(data: BirthInput):
+    # Swiss Ephemeris work is blocking C code; keep it off the event loop.
+    # _compute_chart builds the ORJSONResponse itself (status included), so the
+    # JSON-ready chart skips jsonable_encoder and is serialized on the worker thread
+    return await to_thread.run_sync(_compute_chart, data)
 
 @app.get("/")
 def home():